@@ -0,0 +1,28 @@
+"""
+Ahead-of-time build of the single particle integrators for 1D Coulomb Crystal Simulation
+Run once with `python build_aot.py` to produce the md1d_kernels extension module
+next to this file; particle_sim.py uses it when present, so there is no JIT warmup.
+Rebuild after editing integrators.py, a build older than it is ignored.
+
+numba.pycc is pending deprecation: importing it in Numba 0.68 raises a
+NumbaPendingDeprecationWarning (hidden unless run with -W default), and a future
+release will remove it. The JIT kernels keep working either way.
+"""
+
+import os
+from numba.pycc import CC
+from integrators import _verlet_free, _verlet_harmonic, _verlet_quartic, _verlet_box
+
+cc = CC('md1d_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Every kernel returns (positions, velocities)
+_RESULT = 'UniTuple(f8[:], 2)'
+
+cc.export('verlet_free', f'{_RESULT}(f8, f8, f8, i8, f8)')(_verlet_free.py_func)
+cc.export('verlet_harmonic', f'{_RESULT}(f8, f8, f8, f8, f8, i8, f8)')(_verlet_harmonic.py_func)
+cc.export('verlet_quartic', f'{_RESULT}(f8, f8, f8, f8, f8, i8, f8)')(_verlet_quartic.py_func)
+cc.export('verlet_box', f'{_RESULT}(f8, f8, f8, f8, f8, f8, i8, f8)')(_verlet_box.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,129 @@
+"""
+CUDA Velocity Verlet integrators for large ensembles in 1D Coulomb Crystal Simulation
+One GPU thread per trajectory, state kept in registers through the time loop
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import cuda
+except ImportError:
+    cuda = None
+
+# Threads per block for the trajectory kernels
+THREADS_PER_BLOCK = 256
+
+def gpu_available():
+    """Check whether a CUDA device can be used"""
+    return cuda is not None and cuda.is_available()
+
+def _make_kernel(accel):
+    """
+    Build a trajectory kernel around an acceleration device function
+
+    accel(x, m, p) gets the potential parameters packed in the array p.
+    """
+
+    @cuda.jit
+    def kernel(x, v, out_x, out_v, m, p, dt, n, stride):
+        i = cuda.grid(1)
+        if i >= x.shape[0]:
+            return
+
+        xi = x[i]
+        vi = v[i]
+        ai = accel(xi, m, p)
+        out_x[0, i] = xi
+        out_v[0, i] = vi
+
+        for t in range(1, n + 1):
+            vi += ai * dt / 2
+            xi += vi * dt
+            ai = accel(xi, m, p)
+            vi += ai * dt / 2 # second half step
+
+            # Only write every stride steps to limit global memory traffic.
+            # Output is time-major so neighbouring threads write neighbouring
+            # addresses and the stores coalesce
+            if t % stride == 0:
+                out_x[t // stride, i] = xi
+                out_v[t // stride, i] = vi
+
+    return kernel
+
+if cuda is not None:
+
+    @cuda.jit(device=True)
+    def _accel_free(x, m, p):
+        return 0.0
+
+    @cuda.jit(device=True)
+    def _accel_harmonic(x, m, p):
+        # p = (k, center)
+        return -p[0] * (x - p[1]) / m
+
+    @cuda.jit(device=True)
+    def _accel_quartic(x, m, p):
+        # p = (a, center)
+        return -4.0 * p[0] * (x - p[1])**3 / m
+
+    @cuda.jit(device=True)
+    def _accel_box(x, m, p):
+        # p = (half_width, center, wall_stiffness)
+        dx = x - p[1]
+        overshoot = max(abs(dx) - p[0], 0.0)
+        return -math.copysign(p[2] * overshoot, dx) / m
+
+    KERNELS = {
+        'free': _make_kernel(_accel_free),
+        'harmonic': _make_kernel(_accel_harmonic),
+        'quartic': _make_kernel(_accel_quartic),
+        'box': _make_kernel(_accel_box),
+    }
+
+def verlet_ensemble_gpu(kind, x, v, m, params, n, dt, stride=1):
+    """
+    Integrate K independent particles on the GPU
+
+    Parameters:
+    -----------
+    kind : str
+        Potential kernel: 'free', 'harmonic', 'quartic' or 'box'
+    x : array
+        Initial positions, shape (K,)
+    v : array
+        Initial velocities, shape (K,)
+    m : float
+        Particle mass
+    params : tuple
+        Potential parameters, in the order of the CPU kernels
+    n : int
+        Number of time steps
+    dt : float
+        Time step size
+    stride : int
+        Record the state every stride steps
+
+    Returns:
+    --------
+    pos, vel : arrays
+        Position and velocity histories, time-major, shape (n//stride + 1, K)
+    """
+    if not gpu_available():
+        raise RuntimeError("No CUDA device available, install numba with CUDA support or use the CPU kernels")
+
+    k = x.shape[0]
+    n_out = n // stride + 1
+
+    d_x = cuda.to_device(np.ascontiguousarray(x, dtype=np.float64))
+    d_v = cuda.to_device(np.ascontiguousarray(v, dtype=np.float64))
+    d_p = cuda.to_device(np.array(params + (0.0,), dtype=np.float64))
+    d_out_x = cuda.device_array((n_out, k), dtype=np.float64)
+    d_out_v = cuda.device_array((n_out, k), dtype=np.float64)
+
+    blocks = (k + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    KERNELS[kind][blocks, THREADS_PER_BLOCK](d_x, d_v, d_out_x, d_out_v,
+                                             float(m), d_p, dt, n, stride)
+
+    return d_out_x.copy_to_host(), d_out_v.copy_to_host()
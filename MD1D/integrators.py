@@ -0,0 +1,268 @@
+"""
+Compiled Velocity Verlet integrators for 1D Coulomb Crystal Simulation
+One kernel per potential, with the force expression written out inline
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba not installed - run the kernels as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+@njit(cache=True)
+def _accel_harmonic(x, m, k, center):
+    """Acceleration in V(x) = 0.5 * k * (x-center)^2"""
+    return -k * (x - center) / m
+
+@njit(cache=True)
+def _accel_quartic(x, m, a4, center):
+    """Acceleration in V(x) = a4 * (x-center)^4"""
+    return -4.0 * a4 * (x - center)**3 / m
+
+@njit(cache=True)
+def _accel_box(x, m, half_width, center, wall_stiffness):
+    """Acceleration from the soft walls of a box"""
+    dx = x - center
+    overshoot = max(abs(dx) - half_width, 0.0)
+    return -math.copysign(wall_stiffness * overshoot, dx) / m
+
+@njit(cache=True)
+def _step_free(x, v, a, m, dt):
+    """Advance a free particle by one time step"""
+    x += v * dt
+    return x, v, a
+
+@njit(cache=True)
+def _step_harmonic(x, v, a, m, k, center, dt):
+    """
+    Advance one Velocity Verlet step in V(x) = 0.5 * k * (x-center)^2
+
+    a is the acceleration at x, carried over from the previous step so the
+    force is only evaluated once per step.
+    """
+    v += a * dt / 2
+    x += v * dt
+    a = _accel_harmonic(x, m, k, center)
+    v += a * dt / 2 # second half step
+    return x, v, a
+
+@njit(cache=True)
+def _step_quartic(x, v, a, m, a4, center, dt):
+    """
+    Advance one Velocity Verlet step in V(x) = a4 * (x-center)^4
+
+    a is the acceleration at x, carried over from the previous step so the
+    force is only evaluated once per step.
+    """
+    v += a * dt / 2
+    x += v * dt
+    a = _accel_quartic(x, m, a4, center)
+    v += a * dt / 2 # second half step
+    return x, v, a
+
+@njit(cache=True)
+def _step_box(x, v, a, m, half_width, center, wall_stiffness, dt):
+    """
+    Advance one Velocity Verlet step in a soft-walled box
+
+    a is the acceleration at x, carried over from the previous step so the
+    force is only evaluated once per step.
+    """
+    v += a * dt / 2
+    x += v * dt
+    a = _accel_box(x, m, half_width, center, wall_stiffness)
+    v += a * dt / 2 # second half step
+    return x, v, a
+
+@njit(cache=True)
+def _verlet_free(x, v, m, n, dt):
+    """
+    Integrate a free particle for n steps
+
+    Parameters:
+    -----------
+    x : float
+        Initial position
+    v : float
+        Initial velocity
+    m : float
+        Particle mass
+    n : int
+        Number of time steps
+    dt : float
+        Time step size
+
+    Returns:
+    --------
+    pos, vel : arrays
+        Position and velocity histories (length n+1)
+    """
+    pos = np.empty(n + 1)
+    vel = np.empty(n + 1)
+
+    pos[0] = x
+    vel[0] = v
+
+    a = 0.0
+    for i in range(1, n + 1):
+        x, v, a = _step_free(x, v, a, m, dt)
+        pos[i] = x
+        vel[i] = v
+
+    return pos, vel
+
+@njit(cache=True)
+def _verlet_harmonic(x, v, m, k, center, n, dt):
+    """Integrate a particle in V(x) = 0.5 * k * (x-center)^2 for n steps"""
+    pos = np.empty(n + 1)
+    vel = np.empty(n + 1)
+
+    pos[0] = x
+    vel[0] = v
+
+    a = _accel_harmonic(x, m, k, center)
+    for i in range(1, n + 1):
+        x, v, a = _step_harmonic(x, v, a, m, k, center, dt)
+        pos[i] = x
+        vel[i] = v
+
+    return pos, vel
+
+@njit(cache=True)
+def _verlet_quartic(x, v, m, a4, center, n, dt):
+    """Integrate a particle in V(x) = a4 * (x-center)^4 for n steps"""
+    pos = np.empty(n + 1)
+    vel = np.empty(n + 1)
+
+    pos[0] = x
+    vel[0] = v
+
+    a = _accel_quartic(x, m, a4, center)
+    for i in range(1, n + 1):
+        x, v, a = _step_quartic(x, v, a, m, a4, center, dt)
+        pos[i] = x
+        vel[i] = v
+
+    return pos, vel
+
+@njit(cache=True)
+def _verlet_box(x, v, m, half_width, center, wall_stiffness, n, dt):
+    """Integrate a particle in a soft-walled box for n steps"""
+    pos = np.empty(n + 1)
+    vel = np.empty(n + 1)
+
+    pos[0] = x
+    vel[0] = v
+
+    a = _accel_box(x, m, half_width, center, wall_stiffness)
+    for i in range(1, n + 1):
+        x, v, a = _step_box(x, v, a, m, half_width, center, wall_stiffness, dt)
+        pos[i] = x
+        vel[i] = v
+
+    return pos, vel
+
+@njit(cache=True, parallel=True)
+def _ensemble_free(x, v, m, n, dt, stride):
+    """
+    Integrate K independent free particles for n steps, one per thread
+
+    Parameters:
+    -----------
+    x : array
+        Initial positions, shape (K,)
+    v : array
+        Initial velocities, shape (K,)
+    m : float
+        Particle mass
+    n : int
+        Number of time steps
+    dt : float
+        Time step size
+    stride : int
+        Record the state every stride steps
+
+    Returns:
+    --------
+    pos, vel : arrays
+        Position and velocity histories, time-major, shape (n//stride + 1, K)
+    """
+    pos = np.empty((n // stride + 1, x.shape[0]))
+    vel = np.empty((n // stride + 1, x.shape[0]))
+
+    for j in prange(x.shape[0]):
+        xj, vj, aj = x[j], v[j], 0.0
+        pos[0, j] = xj
+        vel[0, j] = vj
+        for i in range(1, n + 1):
+            xj, vj, aj = _step_free(xj, vj, aj, m, dt)
+            if i % stride == 0:
+                pos[i // stride, j] = xj
+                vel[i // stride, j] = vj
+
+    return pos, vel
+
+@njit(cache=True, parallel=True)
+def _ensemble_harmonic(x, v, m, k, center, n, dt, stride):
+    """Integrate K independent particles in V(x) = 0.5 * k * (x-center)^2 for n steps"""
+    pos = np.empty((n // stride + 1, x.shape[0]))
+    vel = np.empty((n // stride + 1, x.shape[0]))
+
+    for j in prange(x.shape[0]):
+        xj, vj = x[j], v[j]
+        aj = _accel_harmonic(xj, m, k, center)
+        pos[0, j] = xj
+        vel[0, j] = vj
+        for i in range(1, n + 1):
+            xj, vj, aj = _step_harmonic(xj, vj, aj, m, k, center, dt)
+            if i % stride == 0:
+                pos[i // stride, j] = xj
+                vel[i // stride, j] = vj
+
+    return pos, vel
+
+@njit(cache=True, parallel=True)
+def _ensemble_quartic(x, v, m, a4, center, n, dt, stride):
+    """Integrate K independent particles in V(x) = a4 * (x-center)^4 for n steps"""
+    pos = np.empty((n // stride + 1, x.shape[0]))
+    vel = np.empty((n // stride + 1, x.shape[0]))
+
+    for j in prange(x.shape[0]):
+        xj, vj = x[j], v[j]
+        aj = _accel_quartic(xj, m, a4, center)
+        pos[0, j] = xj
+        vel[0, j] = vj
+        for i in range(1, n + 1):
+            xj, vj, aj = _step_quartic(xj, vj, aj, m, a4, center, dt)
+            if i % stride == 0:
+                pos[i // stride, j] = xj
+                vel[i // stride, j] = vj
+
+    return pos, vel
+
+@njit(cache=True, parallel=True)
+def _ensemble_box(x, v, m, half_width, center, wall_stiffness, n, dt, stride):
+    """Integrate K independent particles in a soft-walled box for n steps"""
+    pos = np.empty((n // stride + 1, x.shape[0]))
+    vel = np.empty((n // stride + 1, x.shape[0]))
+
+    for j in prange(x.shape[0]):
+        xj, vj = x[j], v[j]
+        aj = _accel_box(xj, m, half_width, center, wall_stiffness)
+        pos[0, j] = xj
+        vel[0, j] = vj
+        for i in range(1, n + 1):
+            xj, vj, aj = _step_box(xj, vj, aj, m, half_width, center, wall_stiffness, dt)
+            if i % stride == 0:
+                pos[i // stride, j] = xj
+                vel[i // stride, j] = vj
+
+    return pos, vel
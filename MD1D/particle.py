@@ -4,10 +4,23 @@ Particle Class for 1D Coulomb Crystal Simulation
 
 import numpy as np
 
+# Shared random generator for initial conditions
+_rng = np.random.default_rng()
+
+def seed(seed=None):
+    """Reseed the shared random generator so random initial conditions are reproducible"""
+    global _rng
+    _rng = np.random.default_rng(seed)
+
 class Particle1D:
-    """A Single Particle in 1D dimensionless space"""
+    """
+    A Single Particle in 1D dimensionless space
+
+    Convenience wrapper for setting up initial conditions; the simulation
+    functions take plain positions, velocities and masses.
+    """
 
-    def __init__(self, position=None, velocity=None, mass=1.0):
+    def __init__(self, position=None, velocity=None, mass=1.0, rng=None):
         """
         Initialize particle with random or specified position and velocity
         
@@ -19,12 +32,37 @@ class Particle1D:
             Initial velocity (dimensionless). If None, random in [-1, 1]
         mass : float, optional
             Particle mass (dimensionless). Default is 1.0
+        rng : numpy.random.Generator, optional
+            Generator for the random values. Default is the shared one, see seed()
         """
-        self.position = np.random.random() if position is None else position
-        self.velocity = np.random.uniform(-1, 1) if velocity is None else velocity
+        rng = _rng if rng is None else rng
+        self.position = rng.random() if position is None else position
+        self.velocity = rng.uniform(-1, 1) if velocity is None else velocity
         self.mass = mass
         self.acceleration = 0.0
 
+    @classmethod
+    def random_ensemble(cls, n, rng=None):
+        """
+        Draw random initial conditions for n particles at once
+
+        Parameters:
+        -----------
+        n : int
+            Number of particles
+        rng : numpy.random.Generator, optional
+            Generator for the random values. Default is the shared one, see seed()
+
+        Returns:
+        --------
+        positions : array
+            Random positions in [0, 1], shape (n,)
+        velocities : array
+            Random velocities in [-1, 1], shape (n,)
+        """
+        rng = _rng if rng is None else rng
+        return rng.random(n), rng.uniform(-1, 1, n)
+
     def apply_force(self, force):
         """
         Calculate acceleration from force using F = ma
@@ -3,25 +3,81 @@
 Single particle with confining potential
 """
 
+import argparse
+import operator
+import os
+import warnings
 import numpy as np
-from particle import Particle1D
+from particle import Particle1D, seed
 from potentials import NoPotential, HarmonicPotential, QuarticPotential, BoxPotential
 from visualization import plot_trajectory, plot_phase_space, animate_particles
+try:
+    # Ahead-of-time compiled kernels, built by build_aot.py. A build older than
+    # integrators.py is stale and ignored in favour of the JIT kernels
+    import md1d_kernels
+    _source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'integrators.py')
+    if os.path.getmtime(md1d_kernels.__file__) < os.path.getmtime(_source):
+        warnings.warn("md1d_kernels is older than integrators.py, using the JIT kernels. "
+                      "Re-run build_aot.py to rebuild it")
+        raise ImportError("stale md1d_kernels")
+    from md1d_kernels import verlet_free as _verlet_free, verlet_harmonic as _verlet_harmonic
+    from md1d_kernels import verlet_quartic as _verlet_quartic, verlet_box as _verlet_box
+except ImportError:
+    from integrators import _verlet_free, _verlet_harmonic, _verlet_quartic, _verlet_box
+from integrators import _ensemble_free, _ensemble_harmonic, _ensemble_quartic, _ensemble_box
 
-def simulate_particle(particle, potential, duration=10.0, dt=0.01):
+# Compiled integrator and its parameters for each built-in potential type
+_KERNELS = {
+    NoPotential: (_verlet_free, lambda p: ()),
+    HarmonicPotential: (_verlet_harmonic, lambda p: (p.k, p.center)),
+    QuarticPotential: (_verlet_quartic, lambda p: (p.a, p.center)),
+    BoxPotential: (_verlet_box, lambda p: (p.half_width, p.center, p.wall_stiffness)),
+}
+
+# Parallel ensemble integrators, same parameters as _KERNELS
+_ENSEMBLE_KERNELS = {
+    NoPotential: _ensemble_free,
+    HarmonicPotential: _ensemble_harmonic,
+    QuarticPotential: _ensemble_quartic,
+    BoxPotential: _ensemble_box,
+}
+
+# CUDA kernel names, same parameters as _KERNELS
+_GPU_KERNELS = {
+    NoPotential: 'free',
+    HarmonicPotential: 'harmonic',
+    QuarticPotential: 'quartic',
+    BoxPotential: 'box',
+}
+
+# Smallest ensemble that is sent to the GPU automatically
+GPU_MIN_ENSEMBLE = 10_000
+
+def has_exact_solution(potential):
+    """True if simulations in this potential use the closed-form solution instead of Verlet"""
+    return type(potential) is HarmonicPotential and potential.k > 0
+
+def simulate_particle(x0, v0, potential, duration=10.0, dt=0.01, mass=1.0):
     """
     Run simulation for a single particle in a potentail
 
+    A HarmonicPotential with k > 0 uses its exact solution; every other
+    potential, subclasses included, is integrated with Velocity Verlet.
+
     Parameters:
     -----------
-    particle : Particle1D
-        The particle to simulate
+    x0 : float
+        Initial position
+    v0 : float
+        Initial velocity
     potential : Potential
         The confining potential
     duration : float
         Total simulation time
     dt : float
         Time step size
+    mass : float
+        Particle mass
     
     Returns:
     --------
@@ -35,125 +91,379 @@ def simulate_particle(particle, potential, duration=10.0, dt=0.01):
         Dictionary with kinetic, potential, and total energy arrays
     """
 
-    time = 0.0
-    times = [time]
-    positions = [particle.position]
-    velocities = [particle.velocity]
+    n_steps = int(np.ceil(duration / dt))
+    times = np.arange(n_steps + 1) * dt
+    x0, v0, m = float(x0), float(v0), float(mass)
+
+    # Compiled kernel specialized to this potential type, if there is one
+    kernel = _KERNELS.get(type(potential))
+    if kernel is not None:
+        if has_exact_solution(potential):
+            # Closed-form solution, no integration error
+            positions, velocities = potential.analytical(x0, v0, m, times)
+        else:
+            integrate, params = kernel
+            positions, velocities = integrate(x0, v0, m, *params(potential), n_steps, dt)
+
+        # Energies in one vectorized pass over the trajectory
+        ke = 0.5 * m * velocities**2
+        pe = potential.vectorized(positions)
+
+        energies = {
+            'kinetic': ke,
+            'potential': pe,
+            'total': ke + pe
+        }
+
+        return times, positions, velocities, energies
+
+    # Generic Python loop for any other potential
+    positions = np.empty(n_steps + 1)
+    velocities = np.empty(n_steps + 1)
 
     # Energy tracking
-    ke = [0.5 * particle.mass * particle.velocity**2]
-    pe = [potential(particle.position)]
-    total_e = [ke[0] + pe[0]]
+    ke = np.empty(n_steps + 1)
+    pe = np.empty(n_steps + 1)
 
-    while time < duration:
-        # Calculate force from potential
-        force = potential.force(particle.position)
+    # Bind methods and constants to locals, saving attribute lookups every step
+    force = potential.force
+    energy = potential.__call__
+    half_dt = dt / 2
 
-        # Update particle (Velocity Verlet integration)
-        particle.apply_force(force)
-        particle.update_velocity(dt / 2)
-        particle.update_position(dt)
+    x, v = x0, v0
+    positions[0] = x
+    velocities[0] = v
+    ke[0] = 0.5 * m * v**2
+    pe[0] = energy(x)
+
+    # Force at the starting position; afterwards it is carried between steps
+    a = force(x) / m
+
+    for i in range(1, n_steps + 1):
+        # Velocity Verlet integration
+        v += a * half_dt
+        x += v * dt
 
         # Recalculate force at new position
-        force = potential.force(particle.position)
-        particle.apply_force(force)
-        particle.update_velocity(dt / 2) # second half step
+        a = force(x) / m
+        v += a * half_dt # second half step
 
-        # Update time and record state
-        time += dt
-        times.append(time)
-        positions.append(particle.position)
-        velocities.append(particle.velocity)
+        # Record state
+        positions[i] = x
+        velocities[i] = v
 
         # Calculate energies
-        ke.append(0.5 * particle.mass * particle.velocity**2)
-        pe.append(potential(particle.position))
-        total_e.append(ke[-1] + pe[-1])
+        ke[i] = 0.5 * m * v**2
+        pe[i] = energy(x)
+
+    energies = {
+        'kinetic': ke,
+        'potential': pe,
+        'total': ke + pe
+    }
+
+    return times, positions, velocities, energies
+
+def simulate_ensemble(positions, velocities, potential, duration=10.0, dt=0.01, mass=1.0,
+                      stride=1, use_gpu=None):
+    """
+    Run independent simulations for many initial conditions in parallel
+
+    Like simulate_particle, a HarmonicPotential with k > 0 uses its exact
+    solution and every other potential is integrated with Velocity Verlet.
+
+    Parameters:
+    -----------
+    positions : array
+        Initial positions, shape (K,)
+    velocities : array
+        Initial velocities, shape (K,)
+    potential : Potential
+        The confining potential
+    duration : float
+        Total simulation time
+    dt : float
+        Time step size
+    mass : float
+        Particle mass, shared by all trajectories
+    stride : int
+        Record the state every stride time steps, a positive integer
+    use_gpu : bool, optional
+        Run on a CUDA device. If None, used when one is available and
+        there are at least GPU_MIN_ENSEMBLE trajectories. True raises
+        RuntimeError if no device is available. Only potentials integrated
+        with a compiled kernel can use the GPU: a HarmonicPotential with
+        k > 0 (exact solution) and custom potentials always run on the CPU
+        and ignore this flag
+
+    Returns:
+    --------
+    times : array
+        Time points
+    positions : array
+        Position histories, shape (n_times, K)
+    velocities : array
+        Velocity histories, shape (n_times, K)
+    energies : dict
+        Dictionary with kinetic, potential, and total energy arrays, shape (n_times, K)
+    """
+
+    x0 = np.ascontiguousarray(positions, dtype=np.float64)
+    v0 = np.ascontiguousarray(velocities, dtype=np.float64)
+    if x0.ndim != 1 or x0.shape != v0.shape:
+        raise ValueError(f"positions and velocities must be 1D arrays of the same length, "
+                         f"got shapes {x0.shape} and {v0.shape}")
+    stride = operator.index(stride)
+    if stride < 1:
+        raise ValueError(f"stride must be a positive integer, got {stride}")
+    n_steps = int(np.ceil(duration / dt))
+    times = np.arange(0, n_steps + 1, stride) * dt
+
+    integrate = _ENSEMBLE_KERNELS.get(type(potential))
+    if integrate is None or has_exact_solution(potential):
+        use_gpu = False
+    if use_gpu is not False:
+        # Imported here, loading numba.cuda is too slow for every start of the CLI
+        from gpu_integrators import gpu_available, verlet_ensemble_gpu
+    if use_gpu is None:
+        use_gpu = len(x0) >= GPU_MIN_ENSEMBLE and gpu_available()
+
+    if integrate is None:
+        # No compiled kernel - simulate the trajectories one at a time
+        runs = [simulate_particle(x, v, potential, duration, dt, mass)
+                for x, v in zip(x0, v0)]
+        energies = {key: np.stack([run[3][key][::stride] for run in runs], axis=1)
+                    for key in ('kinetic', 'potential', 'total')}
+        positions = np.stack([run[1][::stride] for run in runs], axis=1)
+        velocities = np.stack([run[2][::stride] for run in runs], axis=1)
+        return times, positions, velocities, energies
+
+    params = _KERNELS[type(potential)][1](potential)
+    if has_exact_solution(potential):
+        # Closed-form solution, broadcast over (n_times, K)
+        positions, velocities = potential.analytical(x0, v0, mass, times[:, np.newaxis])
+    elif use_gpu:
+        positions, velocities = verlet_ensemble_gpu(_GPU_KERNELS[type(potential)], x0, v0, mass,
+                                                    params, n_steps, dt, stride)
+    else:
+        positions, velocities = integrate(x0, v0, float(mass), *params, n_steps, dt, stride)
+
+    ke = 0.5 * mass * velocities**2
+    pe = potential.vectorized(positions)
 
     energies = {
-        'kinetic': np.array(ke),
-        'potential': np.array(pe),
-        'total': np.array(total_e)
+        'kinetic': ke,
+        'potential': pe,
+        'total': ke + pe
     }
 
-    return np.array(times), np.array(positions), np.array(velocities), energies
+    return times, positions, velocities, energies
+
+def simulate_crystal(x, v, m, potential, duration=10.0, dt=0.01):
+    """
+    Run simulation for N particles in a potential
+
+    State is kept as contiguous arrays (x, v, a), one entry per particle,
+    and every update is a single vectorized pass over all particles.
+
+    Every potential is integrated with Velocity Verlet, including a
+    HarmonicPotential with k > 0 that simulate_particle and simulate_ensemble
+    solve exactly, so results differ from theirs by the Verlet error.
+
+    Parameters:
+    -----------
+    x : array
+        Initial positions, shape (N,)
+    v : array
+        Initial velocities, shape (N,)
+    m : float or array
+        Particle mass, or masses of shape (N,)
+    potential : Potential
+        The confining potential
+    duration : float
+        Total simulation time
+    dt : float
+        Time step size
+
+    Returns:
+    --------
+    times : array
+        Time points
+    positions : array
+        Position history, shape (n_times, N)
+    velocities : array
+        Velocity history, shape (n_times, N)
+    energies : dict
+        Dictionary with kinetic, potential, and total energy arrays of the
+        whole system
+    """
+
+    x = np.array(x, dtype=np.float64)
+    v = np.array(v, dtype=np.float64)
+    m = np.asarray(m, dtype=np.float64)
+    n_steps = int(np.ceil(duration / dt))
+    times = np.arange(n_steps + 1) * dt
+
+    positions = np.empty((n_steps + 1, len(x)))
+    velocities = np.empty((n_steps + 1, len(x)))
+    positions[0] = x
+    velocities[0] = v
+
+    a = potential.vectorized_force(x) / m
+    for i in range(1, n_steps + 1):
+        # Velocity Verlet integration
+        v += a * (dt / 2)
+        x += v * dt
+        a = potential.vectorized_force(x) / m
+        v += a * (dt / 2) # second half step
+
+        positions[i] = x
+        velocities[i] = v
+
+    ke = (0.5 * m * velocities**2).sum(axis=1)
+    pe = potential.vectorized(positions).sum(axis=1)
+
+    energies = {
+        'kinetic': ke,
+        'potential': pe,
+        'total': ke + pe
+    }
+
+    return times, positions, velocities, energies
+
+# Potentials selectable from the command line: name -> (potential, display name)
+_POTENTIALS = {
+    'none': lambda args: (NoPotential(), "No Potential"),
+    'harmonic': lambda args: (HarmonicPotential(k=args.k), f"Harmonic (k={args.k})"),
+    'quartic': lambda args: (QuarticPotential(a=args.a), f"Quartic (a={args.a})"),
+    'box': lambda args: (BoxPotential(width=args.width), f"Box (width={args.width})"),
+}
+
+def parse_args(argv=None):
+    """Parse command line options, see `python particle_sim.py --help`"""
+    parser = argparse.ArgumentParser(description="1D Coulomb crystal simulation: single particle in a confining potential")
+    parser.add_argument('--interactive', action='store_true',
+                        help="prompt for every setting instead of using the options below")
+    parser.add_argument('--potential', choices=list(_POTENTIALS), default='harmonic',
+                        help="confining potential (default: harmonic)")
+    parser.add_argument('--k', type=float, default=1.0, help="harmonic spring constant (default: 1.0)")
+    parser.add_argument('--a', type=float, default=0.1, help="quartic coefficient (default: 0.1)")
+    parser.add_argument('--width', type=float, default=2.0, help="box width (default: 2.0)")
+    parser.add_argument('--x0', type=float, help="initial position (default: random, or 0.5 if --v0 is given)")
+    parser.add_argument('--v0', type=float, help="initial velocity (default: random, or 0.0 if --x0 is given)")
+    parser.add_argument('--seed', type=int, help="seed for random initial conditions")
+    parser.add_argument('--mass', type=float, default=1.0, help="particle mass (default: 1.0)")
+    parser.add_argument('--duration', type=float, default=20.0, help="simulation duration (default: 20.0)")
+    parser.add_argument('--dt', type=float, default=0.01, help="time step (default: 0.01)")
+    parser.add_argument('--no-plot', action='store_true', help="skip the trajectory and phase space plots")
+    parser.add_argument('--anim', action='store_true', help="show the animation")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        seed(args.seed)
 
-def main():
     print("=" * 60)
     print("1D COULOMB CRYSTAL SIMULATION")
     print("Single Particle in Confining Potential")
     print("=" * 60)
 
-    choice = input("\n Select potential (1-4) [default:2]: ").strip()
-    if not choice:
-        choice = '2'
-
-    # Create potential based on choice
-    if choice == '1':
-        potential = NoPotential()
-        pot_name = "No Potential"
-
-    elif choice == '2':
-        k = float(input("Enter spring constant k [default: 1.0]: ") or 1.0)
-        potential = HarmonicPotential(k=k)
-        pot_name = f'Harmonic (k={k})'
-    elif choice == '3':
-        a = float(input("Enter quartic coefficient a [default: 0.1]: ") or 2.0)
-        potential = QuarticPotential(a=a)
-        pot_name = f"Quartic (a={a})"
-    elif choice == '4':
-        width = float(input("Enter box width [default: 2.0]: ") or 2.0)
-        potential = BoxPotential(width=width)
-        pot_name = f"Box (width={width})"
-    else:
-        print("Invalid choice, using harmonic potential [2]")
-        potential = HarmonicPotential()
-        pot_name = "Harmonic (k=1.0)"
-
-    print(f"\nUsing: {pot_name}")
-
-    # Create particle
-    print("\nParticle initialization:")
-    use_random = input("Use random initial condtions? (y/n) [default: y]: ").strip().lower()
-    if use_random == 'n':
-        pos = float(input("enter initial position [default: 0.5]: ") or 0.5)
-        vel = float(input("Enter initial velocity [default: 0.0]: ") or 0.0)
-        particle = Particle1D(position=pos, velocity=vel)
+    if args.interactive:
+        choice = input("\n Select potential (1-4) [default:2]: ").strip()
+        if not choice:
+            choice = '2'
+
+        # Create potential based on choice
+        if choice == '1':
+            potential = NoPotential()
+            pot_name = "No Potential"
+
+        elif choice == '2':
+            k = float(input("Enter spring constant k [default: 1.0]: ") or 1.0)
+            potential = HarmonicPotential(k=k)
+            pot_name = f'Harmonic (k={k})'
+        elif choice == '3':
+            a = float(input("Enter quartic coefficient a [default: 0.1]: ") or 0.1)
+            potential = QuarticPotential(a=a)
+            pot_name = f"Quartic (a={a})"
+        elif choice == '4':
+            width = float(input("Enter box width [default: 2.0]: ") or 2.0)
+            potential = BoxPotential(width=width)
+            pot_name = f"Box (width={width})"
+        else:
+            print("Invalid choice, using harmonic potential [2]")
+            potential = HarmonicPotential()
+            pot_name = "Harmonic (k=1.0)"
+
+        print(f"\nUsing: {pot_name}")
+
+        # Create particle
+        print("\nParticle initialization:")
+        use_random = input("Use random initial condtions? (y/n) [default: y]: ").strip().lower()
+        if use_random == 'n':
+            pos = float(input("enter initial position [default: 0.5]: ") or 0.5)
+            vel = float(input("Enter initial velocity [default: 0.0]: ") or 0.0)
+            particle = Particle1D(position=pos, velocity=vel)
+        else:
+            particle = Particle1D()
+
+        print(f"\n Initial state: {particle}")
+
+        # Simulation Parameters
+        duration = float(input("\nSimulation duration [default: 20.0]: ") or 20.0)
+        dt = float(input("Time step [default: 0.01]: ") or 0.01)
+
     else:
-        particle = Particle1D()
+        potential, pot_name = _POTENTIALS[args.potential](args)
+        print(f"\nUsing: {pot_name}")
 
-    print(f"\n Initial state: {particle}")
+        if args.x0 is None and args.v0 is None:
+            particle = Particle1D(mass=args.mass)
+        else:
+            particle = Particle1D(position=args.x0 if args.x0 is not None else 0.5,
+                                  velocity=args.v0 if args.v0 is not None else 0.0, mass=args.mass)
+        print(f"\n Initial state: {particle}")
 
-    # Simulation Parameters
-    duration = float(input("\nSimulation duration [default: 20.0]: ") or 20.0)
-    dt = float(input("Time step [default: 0.01]: ") or 0.01)
+        duration, dt = args.duration, args.dt
 
     # Run Simulation
     print("\nRunning Simulation...")
-    times, positions, velocities, energies = simulate_particle(particle, potential, duration=duration, dt=dt)
+    times, positions, velocities, energies = simulate_particle(particle.position, particle.velocity, potential,
+                                                               duration=duration, dt=dt, mass=particle.mass)
 
     print(f"Smulaton complete!")
     print(f"Duration: {duration} (dimensionless time)")
     print(f"Time steps: {len(times)}")
     print(f"Final position: {positions[-1]:4f}")
     print(f"Final velocity: {velocities[-1]:4f}")
-    print(f"\nEnergy conservation:")
+    if has_exact_solution(potential):
+        print(f"\nEnergy conservation (exact harmonic solution, drift is round-off only):")
+    else:
+        print(f"\nEnergy conservation:")
     print(f"Initial total energy: {energies['total'][0]: .6f}")
     print(f"Final total energy: {energies['total'][-1]:.6f}")
     print(f"Energy drift: {abs(energies['total'][-1] - energies['total'][0]):.6e}")
 
     # Generate plots
-    print("\nGenerating plots...")
-    particle_info = f"pos0={positions[0]:.3f}, vel0={velocities[0]:.3f}, {pot_name}"
-    plot_trajectory(times, positions, velocities, energies, particle_info)
+    if args.interactive or not args.no_plot:
+        print("\nGenerating plots...")
+        particle_info = f"pos0={positions[0]:.3f}, vel0={velocities[0]:.3f}, {pot_name}"
+        plot_trajectory(times, positions, velocities, energies, particle_info)
 
-    # Phase space plot
-    show_phase = input("\nShow phase space plot? (y/n) [default: y]: ").strip().lower()
-    if show_phase != 'n':
-        plot_phase_space(positions, velocities)
+        # Phase space plot
+        if args.interactive:
+            show_phase = input("\nShow phase space plot? (y/n) [default: y]: ").strip().lower()
+        else:
+            show_phase = 'y'
+        if show_phase != 'n':
+            plot_phase_space(positions, velocities)
 
     # Animation
-    show_anim = input("\nShow animation? (y/n) [default:n]: ").strip().lower()
+    if args.interactive:
+        show_anim = input("\nShow animation? (y/n) [default:n]: ").strip().lower()
+    else:
+        show_anim = 'y' if args.anim else 'n'
     if show_anim =='y':
         print("Generating animation...")
         animate_particles(times, positions, potential)
@@ -2,6 +2,7 @@
 Potential functions and force calculations for 1D Coulomb Crystal Simulation
 """
 
+import math
 import numpy as np
 
 class Potential:
@@ -14,6 +15,17 @@ class Potential:
     def force(self, x):
         """Calculate force at position x (f = -dV/dx)"""
         raise NotImplementedError
+
+    def vectorized(self, x):
+        """Calculate potential energy for an array of positions x"""
+        # Fallback for subclasses without a NumPy expression
+        x = np.asarray(x, dtype=float)
+        return np.array([self(xi) for xi in x.ravel()]).reshape(x.shape)
+
+    def vectorized_force(self, x):
+        """Calculate force for an array of positions x"""
+        x = np.asarray(x, dtype=float)
+        return np.array([self.force(xi) for xi in x.ravel()]).reshape(x.shape)
     
 class NoPotential(Potential):
     """Free particle - no confining potential"""
@@ -23,6 +35,12 @@ class NoPotential(Potential):
     
     def force(self, x):
         return 0.0
+
+    def vectorized(self, x):
+        return np.zeros(np.shape(x))
+
+    def vectorized_force(self, x):
+        return np.zeros(np.shape(x))
     
 class HarmonicPotential(Potential):
     """Harmonic oscillator potential: V(x) = 0.5* k *x^2"""
@@ -49,6 +67,42 @@ class HarmonicPotential(Potential):
     def force(self, x):
         """Force: F = -k * (x-center)"""
         return - self.k * (x - self.center)
+
+    def vectorized(self, x):
+        """Potential energy for an array of positions"""
+        return 0.5 * self.k * (np.asarray(x) - self.center)**2
+
+    def analytical(self, x0, v0, m, times):
+        """
+        Exact trajectory of a particle released at x0 with velocity v0
+
+        Parameters:
+        -----------
+        x0 : float
+            Initial position
+        v0 : float
+            Initial velocity
+        m : float
+            Particle mass
+        times : array
+            Time points
+
+        Returns:
+        --------
+        positions, velocities : arrays
+            x(t) = center + (x0-center)*cos(wt) + (v0/w)*sin(wt), w = sqrt(k/m)
+        """
+        omega = math.sqrt(self.k / m)
+        cos_wt = np.cos(omega * times)
+        sin_wt = np.sin(omega * times)
+        dx0 = x0 - self.center
+        positions = self.center + dx0 * cos_wt + (v0 / omega) * sin_wt
+        velocities = v0 * cos_wt - dx0 * omega * sin_wt
+        return positions, velocities
+
+    def vectorized_force(self, x):
+        """Force for an array of positions"""
+        return -self.k * (np.asarray(x) - self.center)
     
 class QuarticPotential(Potential):
     """Quartic potential: V(x) = a * x^4"""
@@ -76,6 +130,14 @@ class QuarticPotential(Potential):
         """Force: F = -4 * a * x^3"""
         dx = x - self.center
         return -4.0 * self.a * dx**3
+
+    def vectorized(self, x):
+        """Potential energy for an array of positions"""
+        return self.a * (np.asarray(x) - self.center)**4
+
+    def vectorized_force(self, x):
+        """Force for an array of positions"""
+        return -4.0 * self.a * (np.asarray(x) - self.center)**3
     
 class BoxPotential(Potential):
     """Infinite Square Well Potential"""
@@ -98,21 +160,24 @@ class BoxPotential(Potential):
 
     def __call__(self, x):
         """Potential energy (infinite outsidem zero inside)"""
-        dx = abs(x - self.center)
-        if dx <= self.half_width:
-            return 0.0
-        else:
-            # Soft wall approximation
-            overshoot = dx - self.half_width
-            return 0.5 * self.wall_stiffness * overshoot**2
-        
+        # Soft wall approximation, zero overshoot inside the box
+        overshoot = max(abs(x - self.center) - self.half_width, 0.0)
+        return 0.5 * self.wall_stiffness * overshoot * overshoot
+
     def force(self, x):
         """Force from walls"""
+        # Soft wall force, branchless: zero overshoot inside the box
         dx = x - self.center
-        if abs(dx) <= self.half_width:
-            return 0.0
-        else:
-            # Soft wall force
-            sign = np.sign(dx)
-            overshoot = abs(dx) - self.half_width
-            return - sign * self.wall_stiffness * overshoot
+        overshoot = max(abs(dx) - self.half_width, 0.0)
+        return -math.copysign(self.wall_stiffness * overshoot, dx)
+
+    def vectorized(self, x):
+        """Potential energy for an array of positions"""
+        overshoot = np.maximum(np.abs(np.asarray(x) - self.center) - self.half_width, 0.0)
+        return 0.5 * self.wall_stiffness * overshoot * overshoot
+
+    def vectorized_force(self, x):
+        """Force for an array of positions"""
+        dx = np.asarray(x) - self.center
+        overshoot = np.maximum(np.abs(dx) - self.half_width, 0.0)
+        return -np.copysign(self.wall_stiffness * overshoot, dx)
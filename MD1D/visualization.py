@@ -6,6 +6,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+# Most samples drawn per line; longer histories are decimated before plotting
+MAX_PLOT_POINTS = 50_000
+
 def plot_trajectory(times, positions, velocities, energies=None, particle_info=None):
     """
     Plot particle trajectory, velocity, and enerygy
@@ -24,6 +27,12 @@ def plot_trajectory(times, positions, velocities, energies=None, particle_info=N
         Additional particle information for title
     """
 
+    # Decimate long runs, the difference is not visible at screen resolution
+    step = max(1, -(-len(times) // MAX_PLOT_POINTS))
+    times, positions, velocities = times[::step], positions[::step], velocities[::step]
+    if energies is not None:
+        energies = {key: values[::step] for key, values in energies.items()}
+
     n_plots = 3 if energies is not None else 2
     fig, axes = plt.subplots(n_plots, 1, figsize=(10,4*n_plots))
 
@@ -62,10 +71,11 @@ def plot_phase_space(positions, velocities):
     """Plot phase space (position vs velocity)"""
     fig, ax = plt.subplots(figsize=(8, 8))
 
-    # Color by time
-    colors = np.arange(len(positions))
-    scatter = ax.scatter(positions, velocities, c=colors, cmap='viridis',
-                         alpha=0.6, s=20)
+    # Color by time, decimating long runs
+    step = max(1, -(-len(positions) // MAX_PLOT_POINTS))
+    colors = np.arange(0, len(positions), step)
+    scatter = ax.scatter(positions[::step], velocities[::step], c=colors, cmap='viridis',
+                         alpha=0.6, s=20, rasterized=True)
     
     ax.set_xlabel('Position (dimensionless)', fontsize=12)
     ax.set_ylabel('Velocity (dimensionless)', fontsize=12)
@@ -103,6 +113,7 @@ def animate_particles(times, positions, potential=None):
     # Top plot: Particle Motion
     ax1.set_xlim(x_min, x_max)
     ax1.set_ylim(-0.5, 0.5)
+    ax1.set_aspect('auto')
     ax1.set_xlabel('Position (Dimensionless)', fontsize=12)
     ax1.set_title('1D Particle Motion', fontsize=14)
     ax1.axhline(y=0, color='k', linestyle='-', linewidth=0.5)
@@ -120,12 +131,20 @@ def animate_particles(times, positions, potential=None):
 
     if potential is not None:
         x_plot = np.linspace(x_min, x_max, 200)
-        v_plot = np.array([potential(x) for x in x_plot])
+        v_plot = potential.vectorized(x_plot)
         ax2.plot(x_plot, v_plot, 'k-', linewidth=2)
         ax2.set_ylim(v_plot.min() - 0.1, v_plot.max() + 0.1)
 
     particle_potential, = ax2.plot([], [], 'ro', markersize=10)
 
+    # Trail is drawn at y=0 from a fixed buffer, sliced per frame without allocating
+    trail_length = 100
+    trail_zeros = np.zeros(trail_length + 1)
+
+    # Potential energy along the trajectory, computed once up front
+    if potential is not None:
+        pot_at_particle = potential.vectorized(positions)
+
     def init():
         particle_dot.set_data([], [])
         trail_line.set_data([], [])
@@ -137,21 +156,23 @@ def animate_particles(times, positions, potential=None):
         # Update particle position
         particle_dot.set_data([positions[frame]], [0])
 
-        # Update trail (last 100 points)
-        trail_start = max(0, frame - 100)
-        trail_line.set_data(positions[trail_start: frame+1], np.zeros(frame - trail_start + 1))
+        # Update trail (last 100 points), both arguments are views
+        trail_start = max(0, frame - trail_length)
+        trail_line.set_data(positions[trail_start: frame+1], trail_zeros[:frame - trail_start + 1])
 
         # Update particle on potential plot
         if potential is not None:
-            particle_potential.set_data([positions[frame]], [potential(positions[frame])])
+            particle_potential.set_data([positions[frame]], [pot_at_particle[frame]])
 
         # Update time
         time_text.set_text(f'Time: {times[frame]:.2f}')
 
         return particle_dot, trail_line, particle_potential, time_text
     
-    # Create animation (sample every 5 frames for speed)
-    anim = FuncAnimation(fig, update, init_func=init, frames=range(0, len(times), 5), interval=20, blit=True)
+    # Create animation (sample every 5 frames for speed). Only the moving artists
+    # are redrawn each frame, and rendered frames are not kept in memory
+    anim = FuncAnimation(fig, update, init_func=init, frames=range(0, len(times), 5), interval=20,
+                         blit=True, cache_frame_data=False)
 
     plt.show()
     return anim